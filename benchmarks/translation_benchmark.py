@@ -0,0 +1,55 @@
+'''
+Measures translated rendering throughput offline, against simulated translation backends.
+Compares the in-process FakeTranslator with the full HTTP path (AzureTranslator talking to
+a LocalTranslationServer), for a range of render_stream concurrency levels.
+
+Usage (from the repository root):
+    python benchmarks/translation_benchmark.py
+'''
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from adaptivecardbuilder import *
+
+
+def build_card(i: int) -> AdaptiveCard:
+    '''Builds a small card with a handful of translatable strings'''
+    card = AdaptiveCard()
+    card.add([
+        TextBlock(f"Order {i} has shipped", weight="Bolder"),
+        FactSet(),
+            Fact("Status", "In transit"),
+            Fact("Carrier", "Parcel Co"),
+            "<",
+        ActionOpenUrl(title="Track parcel", url=f"https://example.com/track/{i}"),
+    ])
+    return card
+
+
+async def run(translator: TranslationProvider, cards: int, concurrency: int) -> float:
+    '''Renders the given number of cards through render_stream, returning cards per second'''
+    start = time.perf_counter()
+    async for _ in render_stream((build_card(i) for i in range(cards)), translator_to_lang='fr',
+                                 translator=translator, concurrency=concurrency, use_cache=False):
+        pass
+    return cards / (time.perf_counter() - start)
+
+
+async def main(cards=1000, latency=0.05) -> None:
+    print(f"{cards} cards, {latency * 1000:.0f} ms simulated translation latency per request")
+    for concurrency in (4, 32, 256):
+        fake = FakeTranslator(latency=latency)
+        in_process = await run(fake, cards, concurrency)
+        async with LocalTranslationServer(FakeTranslator(latency=latency)) as server:
+            async with AzureTranslator("local", base_url=server.url) as translator:
+                over_http = await run(translator, cards, concurrency)
+            requests = server.backend.request_count
+        print(f"  concurrency {concurrency:>3}: {in_process:8.0f} cards/s in-process ({fake.request_count} requests), "
+              f"{over_http:8.0f} cards/s over HTTP ({requests} requests)")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+'''
+Measures the cost of schema validation relative to plain serialization.
+
+Usage (from the repository root):
+    python benchmarks/validation_benchmark.py
+'''
+import asyncio
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from adaptivecardbuilder import *
+
+
+def build_card(rows: int) -> AdaptiveCard:
+    '''Builds a card with a mix of text, columns, facts, inputs and actions'''
+    card = AdaptiveCard()
+    for i in range(rows):
+        card.add([
+            TextBlock(f"Row {i}", weight="Bolder", size="Medium", wrap=True),
+            ColumnSet(),
+                Column(width=1),
+                    TextBlock(f"Left {i}", isSubtle=True),
+                    "<",
+                Column(width=2),
+                    Image(url=f"https://example.com/{i}.png", altText="thumbnail"),
+                    "<",
+                "<",
+            FactSet(),
+                Fact("Status", "Open"),
+                Fact("Owner", f"User {i}"),
+                "<",
+            InputText(ID=f"comment_{i}", placeholder="Comment", isMultiline=True),
+            ActionSet(),
+                ActionSubmit(title="Submit", data={"row": i}),
+                "<",
+        ])
+    return card
+
+
+def main(rows=200, repeats=50) -> None:
+    card = build_card(rows)
+    loop = asyncio.new_event_loop()
+
+    def render(validation):
+        return lambda: loop.run_until_complete(card.to_json(use_cache=False, validation=validation))
+
+    plain = min(timeit.repeat(render(None), number=repeats, repeat=5)) / repeats
+    print(f"Card with {rows} rows, best of 5 x {repeats} renders")
+    print(f"  to_json:                      {plain * 1000:8.3f} ms")
+    for mode in ('strict', 'collect'):
+        validated = min(timeit.repeat(render(mode), number=repeats, repeat=5)) / repeats
+        print(f"  to_json(validation={mode!r}): {validated * 1000:8.3f} ms  ({validated / plain:.2f}x)")
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
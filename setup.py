@@ -13,12 +13,16 @@ setup(
     url="https://github.com/ku222/AdaptiveCardBuilder",
     author="Kovid Uppal",
     author_email="kovid.uppal@gmail.com",
+    python_requires='>=3.7',
     install_requires=['aiohttp'],
+    extras_require={
+        'msgpack': ['msgpack'],
+        'cbor': ['cbor2'],
+    },
     long_description=long_description,
     long_description_content_type="text/markdown",
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
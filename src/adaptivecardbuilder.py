@@ -1,11 +1,196 @@
 import json
 from typing import Union, List, Tuple
+from collections import OrderedDict, deque
+import bisect
+import hashlib
+import functools
 import aiohttp
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import ClientSession, web
 import asyncio
 import copy
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
 
-class AdaptiveObject:
+# Attributes used only while building a card - never part of its content
+_BUILDER_ATTRIBUTES = ('_pointer', '_previous', '_preserve_level')
+
+# Attributes holding the memoized content digest of an element, and the elements containing it
+_DIGEST_ATTRIBUTES = ('_content_digest', '_content_owners')
+
+
+class _ContentTracked:
+    '''
+    Base class for cards and their elements, memoizing a digest of each element's content.
+    An element's digest covers its attributes, with every child element standing in as its own digest,
+    so a digest is only recomputed for elements that changed and the elements containing them.
+    Assigning a content attribute, or modifying a list or dict held by one, marks the element
+    and all elements containing it as changed.
+    '''
+    def __setattr__(self, name: str, value: object) -> None:
+        object.__setattr__(self, name, value)
+        # Elements being built have no digest yet, so there is nothing to drop
+        if self.__dict__.get('_content_digest') is not None and name not in _BUILDER_ATTRIBUTES:
+            self._content_changed()
+
+    def __getstate__(self) -> dict:
+        # Copies start out without a digest, and are not contained by anything yet
+        return {key: value for (key, value) in self.__dict__.items() if key not in _DIGEST_ATTRIBUTES}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    def _content_changed(self) -> None:
+        '''Drops the memoized digest of this element and of every element containing it'''
+        stale = [self]
+        while stale:
+            element = stale.pop()
+            # An element without a digest has no containing elements with one either
+            if element.__dict__.get('_content_digest') is not None:
+                element.__dict__['_content_digest'] = None
+                stale.extend(element.__dict__.get('_content_owners', ()))
+
+    def _digest(self) -> str:
+        '''Returns the memoized digest of this element's content, computing it if it changed'''
+        digest = self.__dict__.get('_content_digest')
+        if digest is None:
+            fields = {}
+            for (key, value) in _content_fields(self).items():
+                # Lists and dicts are swapped for tracked copies, so modifying them in place is noticed
+                tracked = _track(value, self)
+                if tracked is not value:
+                    object.__setattr__(self, key, tracked)
+                if type(tracked) is _ContentList:
+                    # Element containers are by far the most common lists, so substitute their digests here
+                    tracked = [item._digest() if isinstance(item, _ContentTracked) else item for item in tracked]
+                fields[key] = tracked
+            canonical = json.dumps(fields, default=_digest_fields, sort_keys=True, separators=(',', ':'))
+            digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+            self.__dict__['_content_digest'] = digest
+        return digest
+
+
+def _track(value: object, owner: _ContentTracked) -> object:
+    '''
+    Returns the value with any lists and dicts in it replaced by tracked copies reporting changes
+    to owner, registering owner as containing any elements in it.
+    Lists and dicts owner already tracks are returned as they are, as their contents were tracked on the way in.
+    '''
+    if isinstance(value, _ContentTracked):
+        owners = value.__dict__.setdefault('_content_owners', [])
+        if not any(existing is owner for existing in owners):
+            owners.append(owner)
+        return value
+    if isinstance(value, (_ContentList, _ContentDict)) and value._owner is owner:
+        return value
+    if isinstance(value, list):
+        return _ContentList(owner, [_track(item, owner) for item in value])
+    if isinstance(value, dict):
+        return _ContentDict(owner, {key: _track(item, owner) for (key, item) in value.items()})
+    return value
+
+
+def _digest_fields(item: object) -> Union[str, dict]:
+    '''Stands in for each nested object while digesting: elements by their own digest'''
+    if isinstance(item, _ContentTracked):
+        return item._digest()
+    return _content_fields(item)
+
+
+class _ContentList(list):
+    '''
+    List held by an element, marking the element as changed whenever it is modified.
+    Values added to it are tracked on the way in.
+    '''
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: _ContentTracked, items=()):
+        super().__init__(items)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as a plain list - the element holding the copy tracks it afresh
+        return (list, (list(self),))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_track(item, self._owner) for item in value]
+        else:
+            value = _track(value, self._owner)
+        super().__setitem__(index, value)
+        self._owner._content_changed()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def append(self, item):
+        super().append(_track(item, self._owner))
+        self._owner._content_changed()
+
+    def extend(self, items):
+        super().extend([_track(item, self._owner) for item in items])
+        self._owner._content_changed()
+
+    def insert(self, index, item):
+        super().insert(index, _track(item, self._owner))
+        self._owner._content_changed()
+
+
+class _ContentDict(dict):
+    '''
+    Dict held by an element, marking the element as changed whenever it is modified.
+    Values added to it are tracked on the way in.
+    '''
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: _ContentTracked, items=()):
+        super().__init__(items)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol):
+        return (dict, (dict(self),))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _track(value, self._owner))
+        self._owner._content_changed()
+
+    def __ior__(self, items):
+        self.update(items)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for (key, value) in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+def _reporting_change(method):
+    '''Wraps a list or dict method which only removes or reorders values, to mark the owning element as changed'''
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._owner._content_changed()
+        return result
+    return wrapper
+
+
+for _name in ('__delitem__', '__imul__', 'pop', 'remove', 'clear', 'sort', 'reverse'):
+    setattr(_ContentList, _name, _reporting_change(getattr(list, _name)))
+for _name in ('__delitem__', 'pop', 'popitem', 'clear'):
+    setattr(_ContentDict, _name, _reporting_change(getattr(dict, _name)))
+
+
+class AdaptiveObject(_ContentTracked):
     '''
     Base class for all Adaptive Objects (TextBlocks, Columns, etc.)
     The following methods can be overriden for each AdaptiveObject:
@@ -37,7 +222,7 @@ class AdaptiveObject:
     def _add_item(self, item: 'AdaptiveObject') -> 'AdaptiveObject':
         """Adds an AdaptiveObject to this object's item container"""
         container = self._get_item_container()
-        assert type(container) == list, "Attempted to add an item to an action container. \
+        assert isinstance(container, list), "Attempted to add an item to an action container. \
         Consider using up_one_level() to back out of the current element"
         container.append(item)
         return item
@@ -45,7 +230,7 @@ class AdaptiveObject:
     def _add_action(self, action: 'AdaptiveObject') -> 'AdaptiveObject':
         """Adds an AdaptiveObject to this object's action container"""
         container = self._get_action_container()
-        assert type(container) == list, "Attempted to add an action to an item container. \
+        assert isinstance(container, list), "Attempted to add an action to an item container. \
         Consider using an ActionSet to add actions into"
         container.append(action)
         return action
@@ -202,7 +387,6 @@ class Fact(AdaptiveObject):
     '''
     def __init__(self, title, value):
         super().__init__()
-        self.type = "FactSet"
         self.title = title
         self.value = value
 
@@ -413,7 +597,305 @@ class InputChoiceSet(AdaptiveObject):
         return self.choices
 
 
-class AdaptiveCard:
+# Language codes accepted by the Azure Translator 3.0 API
+_AZURE_SUPPORTED_LANGUAGES = frozenset(['af', 'ar', 'bn', 'bs', 'bg', 'yue', 'ca', 'zh-Hans', 'zh-Hant', 'hr',
+                                        'cs', 'da', 'nl', 'en', 'et', 'fj', 'fil', 'fi', 'fr', 'de', 'el', 'gu',
+                                        'ht', 'he', 'hi', 'mww', 'hu', 'is', 'id', 'ga', 'it', 'ja', 'kn', 'kk',
+                                        'sw', 'tlh-Latn', 'tlh-Piqd', 'ko', 'lv', 'lt', 'mg', 'ms', 'ml', 'mt',
+                                        'mi', 'mr', 'nb', 'fa', 'pl', 'pt-br', 'pt-pt', 'pa', 'otq', 'ro', 'ru',
+                                        'sm', 'sr-Cyrl', 'sr-Latn', 'sk', 'sl', 'es', 'sv', 'ty', 'ta', 'te', 'th',
+                                        'to', 'tr', 'uk', 'ur', 'vi', 'cy', 'yua'])
+
+
+def _chunk_into_batches(a_list: list, n=100) -> List[list]:
+    '''Chunks a list into a list of lists with size n'''
+    n = max(1, n)
+    return [a_list[i:i+n] for i in range(0, len(a_list), n)]
+
+
+def _apply_translations(object_attribute_pairs: List[Tuple[AdaptiveObject, str]], translations: List[str]) -> None:
+    '''Swaps the text of each (object, attribute) pair with its corresponding translation'''
+    assert len(translations) == len(object_attribute_pairs), "Translation provider returned the wrong number of strings"
+    for ((adaptive_object, attribute), translated_text) in zip(object_attribute_pairs, translations):
+        # Translated text is only swapped in while serializing, then put back - so content digests stay valid
+        object.__setattr__(adaptive_object, attribute, translated_text)
+
+
+class TranslationProvider:
+    '''
+    Base class for translation backends used by to_json() and friends.
+    Providers are batch-first: every string to translate is handed over in a single call.
+    The following can be overriden for each TranslationProvider:
+        1) translate() - required
+        2) supported_languages - set of accepted language codes, or None to accept any
+        3) close() - releases any held resources, such as pooled connections
+        4) cache_token - identifies the provider's output in render cache keys
+    '''
+    supported_languages: Union[None, frozenset] = None
+
+    @property
+    def cache_token(self) -> Union[None, tuple]:
+        '''
+        Override if necessary - returns a key identifying this provider's translations, so renders
+        translated by different backends never share render cache entries.
+        By default returns None, meaning renders translated by this provider are never cached.
+        '''
+        return None
+
+    async def translate(self, texts: List[str], to_lang: str) -> List[str]:
+        '''Returns the translation of each given string into to_lang, in the same order'''
+        raise NotImplementedError
+
+    def supports(self, to_lang: str) -> bool:
+        '''Returns whether this provider can translate into the given language code'''
+        return self.supported_languages is None or to_lang in self.supported_languages
+
+    async def close(self) -> None:
+        '''Override if necessary - by default there is nothing to release'''
+        pass
+
+    async def __aenter__(self) -> 'TranslationProvider':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class AzureTranslator(TranslationProvider):
+    '''
+    Translates through the Azure Translator 3.0 API.
+    Strings are split into requests of up to 100 (the API's limit), sent concurrently over a
+    pooled ClientSession which stays open across calls until close() is called. The session is
+    tied to the event loop it was opened in.
+    See https://docs.microsoft.com/en-us/azure/cognitive-services/translator/quickstart-translator?tabs=python
+    for details on how the translator API works.
+    '''
+    supported_languages = _AZURE_SUPPORTED_LANGUAGES
+
+    def __init__(self, translator_key: str, region='global',
+                 base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0", batch_size=100):
+        self.translator_key = translator_key
+        self.region = region
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self._session: Union[None, ClientSession] = None
+
+    @property
+    def cache_token(self) -> tuple:
+        return ('AzureTranslator', self.base_url)
+
+    async def translate(self, texts: List[str], to_lang: str) -> List[str]:
+        if not texts:
+            return []
+        if self._session is None or self._session.closed:
+            self._session = ClientSession()
+        headers = {
+                "Ocp-Apim-Subscription-Key": self.translator_key,
+                "Ocp-Apim-Subscription-Region": self.region,
+                "Content-Type": "application/json; charset=UTF-8",
+                }
+
+        # Define single post request method
+        async def _post_request(batch: List[str]) -> List[dict]:
+            body = [{"Text": text} for text in batch]
+            async with self._session.post(url=f"{self.base_url}&to={to_lang}", headers=headers, json=body) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        requests = [_post_request(batch) for batch in _chunk_into_batches(texts, self.batch_size)]
+        responses = await asyncio.gather(*requests)
+        return [response_dict['translations'][0]['text'] for batch in responses for response_dict in batch]
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class FakeTranslator(TranslationProvider):
+    '''
+    Deterministic in-process stand-in for a translation service, for tests and load tests.
+    Translates each string into "[<to_lang>] <text>" after simulating `latency` seconds per
+    request plus `latency_per_string` seconds per string, with requests of up to batch_size
+    strings running concurrently. Counts requests and strings received, to inspect batching.
+    '''
+    def __init__(self, latency=0.0, latency_per_string=0.0, batch_size=100, supported_languages=None):
+        self.latency = latency
+        self.latency_per_string = latency_per_string
+        self.batch_size = batch_size
+        self.supported_languages = frozenset(supported_languages) if supported_languages is not None else None
+        self.request_count = 0
+        self.string_count = 0
+
+    @property
+    def cache_token(self) -> tuple:
+        # Output only depends on the input, whatever the latency settings
+        return ('FakeTranslator',)
+
+    async def translate(self, texts: List[str], to_lang: str) -> List[str]:
+        async def _request(batch: List[str]) -> List[str]:
+            self.request_count += 1
+            self.string_count += len(batch)
+            await asyncio.sleep(self.latency + self.latency_per_string * len(batch))
+            return [f"[{to_lang}] {text}" for text in batch]
+
+        responses = await asyncio.gather(*[_request(batch) for batch in _chunk_into_batches(texts, self.batch_size)])
+        return [text for batch in responses for text in batch]
+
+
+class LocalTranslationServer:
+    '''
+    Local HTTP server speaking the Azure Translator 3.0 API, answering with translations from
+    another provider (a FakeTranslator by default). Point an AzureTranslator at its url to
+    exercise the full HTTP translation path offline:
+
+        async with LocalTranslationServer(FakeTranslator(latency=0.05)) as server:
+            translator = AzureTranslator("any key", base_url=server.url)
+            await card.to_json(translator_to_lang='fr', translator=translator)
+    '''
+    def __init__(self, backend: TranslationProvider = None, host='127.0.0.1', port=0):
+        self.backend = backend or FakeTranslator()
+        self.host = host
+        self.port = port
+        self._runner: Union[None, web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        '''Base url to hand to AzureTranslator, available once the server has started'''
+        return f"http://{self.host}:{self.port}/translate?api-version=3.0"
+
+    async def start(self) -> None:
+        '''Starts serving. If port is 0, a free port is picked and stored in self.port'''
+        app = web.Application()
+        app.router.add_post('/translate', self._handle_translate)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        '''Stops serving'''
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'LocalTranslationServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle_translate(self, request: web.Request) -> web.Response:
+        to_lang = request.query.get('to')
+        if not to_lang or not self.backend.supports(to_lang):
+            return web.json_response({"error": {"code": 400036, "message": "The target language is not valid."}},
+                                     status=400)
+        body = await request.json()
+        translations = await self.backend.translate([item["Text"] for item in body], to_lang)
+        return web.json_response([{"translations": [{"text": text, "to": to_lang}]} for text in translations])
+
+
+def _default_translator(translator_key: str, region: str, base_url: str) -> AzureTranslator:
+    '''Builds the Azure provider used when only translator_key (and friends) are given'''
+    assert translator_key, "Translation step requires an Azure Translation API key, or a translator"
+    return AzureTranslator(translator_key, region=region, base_url=base_url)
+
+
+def _content_fields(item: object) -> dict:
+    '''Returns the attributes of an object that make up its content, skipping builder-only attributes'''
+    return {key: value for key, value in item.__dict__.items()
+            if key not in _BUILDER_ATTRIBUTES and key not in _DIGEST_ATTRIBUTES}
+
+
+def _serializable_fields(item: object) -> dict:
+    '''
+    Returns the attributes of an object that belong in its serialized payload.
+    Same as _content_fields, but also drops directives (e.g. dont_translate)
+    which only steer the builder and are never sent to clients.
+    '''
+    fields = _content_fields(item)
+    fields.pop('dont_translate', None)
+    return fields
+
+
+# Each encoder walks the card tree calling `fields` on every element object, which
+# returns the attributes to serialize (and may validate them along the way)
+
+def _encode_json(card: 'AdaptiveCard', fields=_serializable_fields) -> str:
+    '''Serializes a card (and all its elements) into a JSON string'''
+    return json.dumps(card, default=fields, sort_keys=False)
+
+
+def _encode_json_bytes(card: 'AdaptiveCard', fields=_serializable_fields) -> bytes:
+    '''Serializes a card (and all its elements) into UTF-8 encoded JSON bytes'''
+    return _encode_json(card, fields).encode('utf-8')
+
+
+def _encode_msgpack(card: 'AdaptiveCard', fields=_serializable_fields) -> bytes:
+    '''Serializes a card (and all its elements) into MessagePack bytes'''
+    assert msgpack, "MessagePack output requires the msgpack package: pip install adaptivecardbuilder[msgpack]"
+    return msgpack.packb(card, default=fields, use_bin_type=True)
+
+
+def _encode_cbor(card: 'AdaptiveCard', fields=_serializable_fields) -> bytes:
+    '''Serializes a card (and all its elements) into CBOR bytes'''
+    assert cbor2, "CBOR output requires the cbor2 package: pip install adaptivecardbuilder[cbor]"
+    return cbor2.dumps(card, default=lambda encoder, item: encoder.encode(fields(item)))
+
+
+# Serializers used by to_json() ('json') and to_bytes() (the rest), all sharing the same tree walk.
+# JSON bytes have their own encoder so cached bytes output is served without re-encoding
+_ENCODERS = {
+    'json': _encode_json,
+    'json-bytes': _encode_json_bytes,
+    'msgpack': _encode_msgpack,
+    'cbor': _encode_cbor,
+}
+
+# Output formats accepted by to_bytes(), with the encoder each uses
+_BYTES_FORMATS = {
+    'json': 'json-bytes',
+    'msgpack': 'msgpack',
+    'cbor': 'cbor',
+}
+
+
+class RenderCache:
+    '''
+    Least-recently-used cache of serialized cards, keyed on
+    (content hash, version, schema, target language, translator, output format, whether validated).
+    Once maxsize entries are held, the least recently used entry is evicted.
+    '''
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[tuple, Union[str, bytes]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Union[None, str, bytes]:
+        '''Returns the cached output for this key (marking it as recently used), or None on a miss'''
+        serialized = self._entries.get(key)
+        if serialized is not None:
+            self._entries.move_to_end(key)
+        return serialized
+
+    def put(self, key: tuple, serialized: Union[str, bytes]) -> None:
+        '''Stores output under this key, evicting the least recently used entry if full'''
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = serialized
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        '''Removes all cached output'''
+        self._entries.clear()
+
+
+class AdaptiveCard(_ContentTracked):
     '''
     An Adaptive Card, containing a free-form body of card elements, and an optional set of actions.
     https://adaptivecards.io/explorer/AdaptiveCard.html.
@@ -537,46 +1019,78 @@ class AdaptiveCard:
         '''Go back to the top of the card (sets pointer to the card itself)'''
         self._pointer = self
 
+    def content_hash(self) -> str:
+        '''
+        Returns a stable hex digest computed over this card's element tree.
+        Builder-only attributes (_pointer, _previous, _preserve_level) are excluded,
+        so two cards holding the same elements hash identically regardless of how
+        they were built. Useful as an ETag or for de-duplicating outbound cards.
+
+        Digests are memoized per element, so only elements changed since the last call
+        (and the elements containing them) are hashed again. Lists and dicts held by elements
+        are replaced by tracked copies on the first call - modify them through the card
+        (e.g. card.body.append()) rather than through references kept from before.
+        '''
+        return self._digest()
+
     async def to_json(self, version="1.2", schema="http://adaptivecards.io/schemas/adaptive-card.json",
         translator_to_lang=None, translator_key=None, translator_region='global',
-        translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0"
-        ) -> str:
+        translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0",
+        use_cache=True, validation=None, translator: TranslationProvider = None) -> str:
         '''
         Asynchronous method which serializes this card object into a JSON string.
-        Deletes any construction-related attributes from all constituent AdaptiveItems,
+        Skips any construction-related attributes from all constituent AdaptiveItems,
         translates any attributes if required, and then returns a JSON string.
 
         Translation occurs if a translator_to_lang code is provided.
+        By default this goes through the Azure Translator API using translator_key, translator_region
+        and translator_base_url. Pass a TranslationProvider as translator to use any other backend.
         See https://docs.microsoft.com/en-us/azure/cognitive-services/translator/quickstart-translator?tabs=python
         for details on how the translator API works.
+
+        The card itself is never modified by translation: translated text is only swapped in while
+        serializing, so repeated calls always translate the original text.
+
+        Unless use_cache is False, the module-level render_cache is consulted first, keyed on
+        (content_hash(), version, schema, translator_to_lang, the translator's cache_token, output format,
+        whether validated). On a hit, neither serialization nor translation takes place. Translated renders
+        are only cached if the translator has a cache_token. Content hashes are memoized per element,
+        so the lookup only rehashes elements changed since the card was last hashed.
+
+        Validation against the schema of the given version occurs if a validation mode is provided,
+        in the same pass as serialization. A CardValidationError is raised on invalid cards:
+            'strict'  - raise on the first problem found
+            'collect' - finish the pass, then raise listing every problem found
         '''
-        self.schema = schema
-        self.version = version
-        # Try translate if needed first
-        if translator_to_lang:
-            assert translator_key, "Translation step requires an Azure Translation API key"
-            await self._translate_elements(to_lang=translator_to_lang, translator_key=translator_key,
-                                           region=translator_region, base_url=translator_base_url)
-        # Define helper method prior to serializing
-        def dictify(item: object):
-            '''Helper method to delete construction-related attributes'''
-            has_pointer = True if getattr(item, '_pointer', 'no') != 'no' else False
-            has_previous = True if getattr(item, '_previous', 'no') != 'no' else False
-            has_preserve_level = True if getattr(item, '_preserve_level', 'no') != 'no' else False
-            has_dont_translate = True if getattr(item, 'dont_translate', 'no') != 'no' else False
-            if has_pointer: del item._pointer
-            if has_previous: del item._previous
-            if has_preserve_level: del item._preserve_level
-            if has_dont_translate: del item.dont_translate
-            return item.__dict__
-        # Return serialized card
-        serialized = json.dumps(self, default=dictify, sort_keys=False)
-        return serialized
+        return await self._render('json', version=version, schema=schema, translator_to_lang=translator_to_lang,
+                                  translator_key=translator_key, translator_region=translator_region,
+                                  translator_base_url=translator_base_url, use_cache=use_cache,
+                                  validation=validation, translator=translator)
+
+    async def to_bytes(self, format='json', version="1.2", schema="http://adaptivecards.io/schemas/adaptive-card.json",
+        translator_to_lang=None, translator_key=None, translator_region='global',
+        translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0",
+        use_cache=True, validation=None, translator: TranslationProvider = None) -> bytes:
+        '''
+        Asynchronous method which serializes this card object straight into bytes, ready to be
+        handed to a message queue or socket. Supported formats are:
+            'json'    - UTF-8 encoded JSON, identical to to_json()
+            'msgpack' - MessagePack (requires the msgpack package)
+            'cbor'    - CBOR (requires the cbor2 package)
+        Use card_from_bytes() with the same format to load the card back.
+
+        Translation, caching and validation behave exactly as in to_json().
+        '''
+        assert format in _BYTES_FORMATS, f"Unsupported output format: {format}. Use one of {list(_BYTES_FORMATS)}"
+        return await self._render(_BYTES_FORMATS[format], version=version, schema=schema,
+                                  translator_to_lang=translator_to_lang, translator_key=translator_key,
+                                  translator_region=translator_region, translator_base_url=translator_base_url,
+                                  use_cache=use_cache, validation=validation, translator=translator)
 
     async def to_dict(self, version="1.2", schema="http://adaptivecards.io/schemas/adaptive-card.json",
         translator_to_lang=None, translator_key=None, translator_region='global',
-        translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0"
-        ) -> dict:
+        translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0",
+        use_cache=True, validation=None, translator: TranslationProvider = None) -> dict:
         '''
         Asynchronous method which turns this card object into a plain python dictionary representation by
         sequentially calling its own to_json() method then re-serializing back into a python dictionary.
@@ -587,76 +1101,91 @@ class AdaptiveCard:
         '''
         serialized = await self.to_json(version=version, schema=schema, translator_to_lang=translator_to_lang,
                                         translator_key=translator_key, translator_region=translator_region,
-                                        translator_base_url=translator_base_url)
+                                        translator_base_url=translator_base_url, use_cache=use_cache,
+                                        validation=validation, translator=translator)
         return json.loads(serialized)
 
-    async def _translate_elements(self, to_lang, translator_key, region='global',
-                            base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0") -> None:
+    async def _render(self, format: str, version: str, schema: str, translator_to_lang: str, translator_key: str,
+                      translator_region: str, translator_base_url: str, use_cache: bool, validation: str = None,
+                      translator: TranslationProvider = None,
+                      batcher: '_TranslationBatcher' = None) -> Union[str, bytes]:
+        '''
+        Shared implementation of to_json(), to_bytes() and render_stream(): consults the render cache,
+        translates if required, then serializes with the encoder of the given name (validating
+        each element as it is serialized, if a validation mode is given).
+        If a batcher is given, translation requests are pooled with those of other cards.
+        '''
+        validator = CardValidator(self, version, validation) if validation else None
+        # Only assigned when different, as assigning marks the card as changed
+        if self.__dict__.get('schema') != schema:
+            self.schema = schema
+        if self.__dict__.get('version') != version:
+            self.version = version
+        # Translated output is cached per translation backend - or not at all, if it has no cache token
+        translation_token = None
+        if use_cache and translator_to_lang:
+            provider = batcher.translator if batcher else translator
+            translation_token = provider.cache_token if provider else ('AzureTranslator', translator_base_url)
+        # Output that passed validation is cached separately, so hits can skip re-validating
+        cache_key = None
+        if use_cache and (translation_token or not translator_to_lang):
+            cache_key = (self.content_hash(), version, schema, translator_to_lang, translation_token, format,
+                         bool(validator))
+        if cache_key:
+            cached = render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        # Remember the original text, as translation swaps it out in place
+        originals = []
+        if translator_to_lang:
+            originals = [(adaptive_object, attribute, getattr(adaptive_object, attribute))
+                         for (adaptive_object, attribute) in self._prepare_elements_for_translation()]
+        try:
+            # Try translate if needed first
+            if batcher:
+                await batcher.translate(self)
+            elif translator_to_lang:
+                await self._translate_elements(to_lang=translator_to_lang, translator_key=translator_key,
+                                               region=translator_region, base_url=translator_base_url,
+                                               translator=translator)
+            # Serialize card - no awaits from here on, so no other render sees the translated text
+            if validator:
+                serialized = _ENCODERS[format](self, validator.fields)
+                validator.raise_errors()
+            else:
+                serialized = _ENCODERS[format](self)
+        finally:
+            # Put the original text back, leaving the card (and its content hash) unchanged
+            for (adaptive_object, attribute, text) in originals:
+                object.__setattr__(adaptive_object, attribute, text)
+        if cache_key:
+            render_cache.put(cache_key, serialized)
+        return serialized
+
+    async def _translate_elements(self, to_lang, translator_key=None, region='global',
+                            base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0",
+                            translator: TranslationProvider = None) -> None:
         '''
         Utility function to translate all our card's elements for us
         First calls the _prepare_elements_for_translation method to recursively pull out items and their text attributes
-        Then calls the Azure Translator 3.0 API to translate all elements
+        Then hands all their text to the translation provider (the Azure Translator 3.0 API by default) in one batch
         Then swaps the current text with the corresponding translated text
         '''
-        supported_languages = ['af', 'ar', 'bn', 'bs', 'bg', 'yue', 'ca', 'zh-Hans', 'zh-Hant', 'hr', 'cs', 'da', 'nl',
-                                'en', 'et', 'fj', 'fil', 'fi', 'fr', 'de', 'el', 'gu', 'ht', 'he', 'hi', 'mww', 'hu', 'is',
-                                'id', 'ga', 'it', 'ja', 'kn', 'kk', 'sw', 'tlh-Latn', 'tlh-Piqd', 'ko', 'lv', 'lt', 'mg', 'ms',
-                                'ml', 'mt', 'mi', 'mr', 'nb', 'fa', 'pl', 'pt-br', 'pt-pt', 'pa', 'otq', 'ro', 'ru', 'sm', 'sr-Cyrl',
-                                'sr-Latn', 'sk', 'sl', 'es', 'sv', 'ty', 'ta', 'te', 'th', 'to', 'tr', 'uk', 'ur', 'vi', 'cy', 'yua']
-        # to_lang value must be supported
-        assert to_lang in supported_languages, "Given language code not supported by Azure"
-        # Pull out object attribute pairs
-        object_attribute_pairs = self._prepare_elements_for_translation()
-
-        # Make/send translation request given these object attribute pairs
-        response_batches: List[List[dict]] = await self._send_translation_requests(to_lang,
-                                                                                   translator_key,
-                                                                                   region,
-                                                                                   base_url,
-                                                                                   object_attribute_pairs)
-        # Unpack translations
-        i = 0
-        for batch in response_batches:
-            for response_dict in batch: # up to 100 dicts per batch
-                translations_array = response_dict.get('translations')
-                first_result = translations_array[0]
-                translated_text = first_result['text']
-                # Update own objects
-                (adaptive_object, attribute) = object_attribute_pairs[i]
-                setattr(adaptive_object, attribute, translated_text)
-                i += 1
-
-    async def _send_translation_requests(self, to_lang: str, translator_key: str, region: str,
-                                        base_url: str, object_attribute_pairs: list) -> List[List[dict]]:
-        '''
-        Asynchronously sends translation requests to our Translator API instance.
-        Breaks the body of the requests into 100-length batches to respect
-        max request limits. Returns a List of List of Dicts.
-        '''
-        # Construct request body
-        body: List[dict] = []
-        for (adaptive_object, attribute) in object_attribute_pairs:
-            item_to_add = {"Text": getattr(adaptive_object, attribute)}
-            body.append(item_to_add)
-        # Chunk body into a list of lists with size 100 to respect request limits
-        chunked_bodies = self._chunk_into_batches(body)
-
-        # Define single post request method
-        async def _post_request(session: ClientSession, a_body: List[dict]) -> dict:
-            headers = {
-                    "Ocp-Apim-Subscription-Key": translator_key,
-                    "Ocp-Apim-Subscription-Region": region,
-                    "Content-Type": "application/json; charset=UTF-8",
-                    }
-            response: ClientResponse = await session.post(url=f"{base_url}&to={to_lang}", headers=headers, json=a_body)
-            return await response.json()
-
-        async with ClientSession() as session:
-            requests = []
-            for body in chunked_bodies:
-                requests.append(_post_request(session=session, a_body=body))
-            responses = await asyncio.gather(*requests, return_exceptions=True)
-            return responses
+        provider = translator or _default_translator(translator_key, region, base_url)
+        try:
+            # to_lang value must be supported
+            assert provider.supports(to_lang), f"Given language code not supported by {type(provider).__name__}"
+            # Pull out object attribute pairs
+            object_attribute_pairs = self._prepare_elements_for_translation()
+            if not object_attribute_pairs:
+                return
+            texts = [getattr(adaptive_object, attribute) for (adaptive_object, attribute) in object_attribute_pairs]
+            translations = await provider.translate(texts, to_lang)
+        finally:
+            # Only close providers we opened ourselves
+            if translator is None:
+                await provider.close()
+        _apply_translations(object_attribute_pairs, translations)
 
     def _prepare_elements_for_translation(self) -> List[Tuple[AdaptiveObject, str]]:
             '''
@@ -701,10 +1230,9 @@ class AdaptiveCard:
                 recursive_find(action)
             return object_attribute_pairs
 
-    def _chunk_into_batches(self, a_list: list, n=100) -> List[list]:
-        '''Chunks a list into a list of lists with size n'''
-        n = max(1, n)
-        return [a_list[i:i+n] for i in range(0, len(a_list), n)]
+
+# Shared cache of rendered output, consulted by AdaptiveCard.to_json() and to_dict()
+render_cache = RenderCache()
 
 
 def combine_adaptive_cards(cards: List[AdaptiveCard]) -> AdaptiveCard:
@@ -721,6 +1249,216 @@ def combine_adaptive_cards(cards: List[AdaptiveCard]) -> AdaptiveCard:
     return first_card
 
 
+class _TranslationBatcher:
+    '''
+    Pools the translatable strings of several in-flight cards into shared translation requests.
+    Strings submitted within the same linger window are sent to the provider in a single call,
+    and each caller is woken with its own translations once the batch holding them returns.
+
+    Renders registered with expect() let the batch go out early: once each of them has submitted
+    its strings (or finished without any), and no more cards are expected, there is nothing to wait for.
+    '''
+    def __init__(self, translator: TranslationProvider, to_lang: str, linger=0.005, batch_size=100):
+        self.translator = translator
+        self.to_lang = to_lang
+        self.linger = linger
+        self.batch_size = batch_size
+        self._pending: List[Tuple[AdaptiveCard, List[Tuple[AdaptiveObject, str]], asyncio.Future]] = []
+        self._pending_count = 0
+        self._flush_task: Union[None, asyncio.Future] = None
+        # Strong references to running flushes - the event loop only keeps weak ones, and a
+        # flush collected mid-flight would leave its callers waiting forever
+        self._running_flushes: set = set()
+        # Registered renders yet to submit their strings, and whether further cards may still arrive
+        self._unsubmitted: set = set()
+        self.more_cards_expected = True
+        self._closed = False
+
+    def expect(self, render: asyncio.Future) -> None:
+        '''Registers a render task whose strings the batch should wait for'''
+        self._unsubmitted.add(render)
+        render.add_done_callback(self._settle)
+
+    def _settle(self, render: asyncio.Future) -> None:
+        # Renders finishing without submitting (cache hits, errors) no longer hold the batch up
+        if render in self._unsubmitted:
+            self._unsubmitted.discard(render)
+            self.flush_if_ready()
+
+    def flush_if_ready(self) -> None:
+        '''Sends the pending strings straight away if no further strings can join them'''
+        if self._closed or not self._pending or self._unsubmitted or self.more_cards_expected:
+            return
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._start_flush(self._flush())
+
+    async def translate(self, card: AdaptiveCard) -> None:
+        '''
+        Translates the given card's elements in place, alongside those of other cards.
+        Translations are applied here (not when the batch returns) so the caller sees them
+        without any other task running in between.
+        '''
+        self._unsubmitted.discard(asyncio.current_task())
+        object_attribute_pairs = card._prepare_elements_for_translation()
+        if not object_attribute_pairs:
+            self.flush_if_ready()
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((card, object_attribute_pairs, future))
+        self._pending_count += len(object_attribute_pairs)
+        if self._pending_count >= self.batch_size:
+            # A full batch is ready - no point waiting for more
+            self._start_flush(self._flush())
+        else:
+            self.flush_if_ready()
+            if self._pending and self._flush_task is None:
+                self._flush_task = self._start_flush(self._flush_after_linger())
+        _apply_translations(object_attribute_pairs, await future)
+
+    def close(self) -> None:
+        '''Drops any pending strings and stops further flushes, once the stream is done with'''
+        self._closed = True
+        self._pending, self._pending_count = [], 0
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def _start_flush(self, coroutine) -> asyncio.Future:
+        '''Runs a flush as a task, keeping hold of it until it completes'''
+        task = asyncio.ensure_future(coroutine)
+        self._running_flushes.add(task)
+        task.add_done_callback(self._running_flushes.discard)
+        return task
+
+    async def _flush_after_linger(self) -> None:
+        await asyncio.sleep(self.linger)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        '''Sends every pending string in one round of requests and wakes up their callers'''
+        pending, self._pending, self._pending_count = self._pending, [], 0
+        if not pending:
+            return
+        object_attribute_pairs = [pair for (_, pairs, _) in pending for pair in pairs]
+        texts = [getattr(adaptive_object, attribute) for (adaptive_object, attribute) in object_attribute_pairs]
+        try:
+            translations = await self.translator.translate(texts, self.to_lang)
+            assert len(translations) == len(texts), "Translation provider returned the wrong number of strings"
+        except Exception as e:
+            for (_, _, future) in pending:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            # Hand each card back its own slice of the translations
+            offset = 0
+            for (_, pairs, future) in pending:
+                if not future.done():
+                    future.set_result(translations[offset:offset + len(pairs)])
+                offset += len(pairs)
+
+
+async def render_stream(cards, format=None, version="1.2", schema="http://adaptivecards.io/schemas/adaptive-card.json",
+    translator_to_lang=None, translator_key=None, translator_region='global',
+    translator_base_url="https://api.cognitive.microsofttranslator.com/translate?api-version=3.0",
+    use_cache=True, validation=None, translator: TranslationProvider = None, concurrency=8, ordered=True,
+    linger=0.005):
+    '''
+    Asynchronous generator which renders a stream of cards with bounded concurrency.
+    Accepts an async iterable (e.g. a database cursor or queue consumer) or a plain iterable of cards,
+    and yields each card's JSON string - or, if a format is given, its bytes as per to_bytes().
+
+    At most `concurrency` cards are in flight at once; further cards are only pulled from the source
+    as results are consumed, so a slow consumer applies backpressure all the way back to the source.
+    While some cards wait on translation, others are being serialized.
+
+    If translator_to_lang is given, translatable strings from all in-flight cards are pooled into
+    shared translation requests. Strings arriving within `linger` seconds of each other are batched,
+    though a batch goes out straight away once every in-flight card has submitted its strings and
+    no further cards can join (the concurrency limit is reached, or the source has run dry).
+    Unless a translator is given, a single pooled AzureTranslator serves the whole stream.
+
+    Results are yielded in source order if `ordered` is True. Otherwise each is yielded as soon as it
+    completes, as a (card, result) pair so it can be routed (or acknowledged) back to where the card came from.
+    Validation behaves as in to_json().
+    '''
+    assert concurrency >= 1, "concurrency must be at least 1"
+    assert format is None or format in _BYTES_FORMATS, \
+        f"Unsupported output format: {format}. Use one of {list(_BYTES_FORMATS)}"
+    encoder = _BYTES_FORMATS[format] if format else 'json'
+    provider = None
+    batcher = None
+    if translator_to_lang:
+        provider = translator or _default_translator(translator_key, translator_region, translator_base_url)
+        assert provider.supports(translator_to_lang), \
+            f"Given language code not supported by {type(provider).__name__}"
+        batcher = _TranslationBatcher(provider, translator_to_lang, linger=linger)
+
+    async def render(card: AdaptiveCard) -> Union[str, bytes]:
+        return await card._render(encoder, version=version, schema=schema,
+                                  translator_to_lang=translator_to_lang, translator_key=translator_key,
+                                  translator_region=translator_region, translator_base_url=translator_base_url,
+                                  use_cache=use_cache, validation=validation, batcher=batcher)
+
+    # Accept plain iterables as well as async ones
+    if hasattr(cards, '__aiter__'):
+        source = cards.__aiter__()
+    else:
+        source = _aiter_from(cards)
+    in_flight: List[asyncio.Future] = []
+    # Source card of each in-flight render, for pairing with unordered results
+    cards_in_flight = {}
+    exhausted = False
+    try:
+        while True:
+            # Top up in-flight cards to the concurrency limit
+            while not exhausted and len(in_flight) < concurrency:
+                if batcher:
+                    batcher.more_cards_expected = True
+                try:
+                    card = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(render(card))
+                in_flight.append(task)
+                cards_in_flight[task] = card
+                if batcher:
+                    batcher.expect(task)
+            if batcher:
+                # No more cards until one of those in flight completes
+                batcher.more_cards_expected = False
+                batcher.flush_if_ready()
+            if not in_flight:
+                break
+            if ordered:
+                task = in_flight.pop(0)
+                del cards_in_flight[task]
+                yield await task
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in [task for task in in_flight if task in done]:
+                    in_flight.remove(task)
+                    yield (cards_in_flight.pop(task), task.result())
+    finally:
+        # Consumer stopped early or a card failed - don't leave work running
+        if batcher:
+            batcher.close()
+        for task in in_flight:
+            task.cancel()
+        # Only close providers we opened ourselves
+        if provider is not None and translator is None:
+            await provider.close()
+
+
+async def _aiter_from(iterable):
+    '''Wraps a plain iterable as an async iterator'''
+    for item in iterable:
+        yield item
+
+
 class ActionShowCard(AdaptiveObject):
     '''
     Defines an AdaptiveCard which is shown to the user when the button or link is clicked.
@@ -744,3 +1482,584 @@ class ActionShowCard(AdaptiveObject):
     def _translatable_attributes(self) -> List[str]:
         return ['title']
 
+
+
+# Maps serialized "type" values back onto their element classes
+_ELEMENT_CLASSES = {
+    "AdaptiveCard": AdaptiveCard,
+    "Container": Container,
+    "Column": Column,
+    "ColumnSet": ColumnSet,
+    "TextBlock": TextBlock,
+    "Image": Image,
+    "ImageSet": ImageSet,
+    "ActionSet": ActionSet,
+    "Action.OpenUrl": ActionOpenUrl,
+    "Action.Submit": ActionSubmit,
+    "Action.ShowCard": ActionShowCard,
+    "Action.ToggleVisibility": ActionToggleVisibility,
+    "FactSet": FactSet,
+    "Media": Media,
+    "TextRun": TextRun,
+    "RichTextBlock": RichTextBlock,
+    "Input.Text": InputText,
+    "Input.Number": InputNumber,
+    "Input.Date": InputDate,
+    "Input.Time": InputTime,
+    "Input.Toggle": InputToggle,
+    "Input.ChoiceSet": InputChoiceSet,
+}
+
+# Elements without a "type" of their own, identified by the container holding them
+_CONTAINED_CLASSES = {
+    "facts": Fact,
+    "sources": MediaSource,
+    "targetElements": TargetElement,
+    "choices": InputChoice,
+}
+
+# Attributes holding lists of child elements
+_CONTAINER_ATTRIBUTES = ('body', 'actions', 'items', 'columns', 'images', 'inlines',
+                         'facts', 'sources', 'targetElements', 'choices')
+
+# Containers each class creates in its constructor, restored when a payload leaves them out
+_DEFAULT_CONTAINERS = {
+    AdaptiveCard: ('body', 'actions'),
+    Container: ('items',),
+    Column: ('items',),
+    ColumnSet: ('columns',),
+    ImageSet: ('images',),
+    ActionSet: ('actions',),
+    FactSet: ('facts',),
+    Media: ('sources',),
+    RichTextBlock: ('inlines',),
+    ActionToggleVisibility: ('targetElements',),
+    InputChoiceSet: ('choices',),
+}
+
+
+def _load_element(data: dict, cls: type = None, previous: AdaptiveObject = None) -> Union[AdaptiveCard, AdaptiveObject]:
+    '''
+    Recursively rebuilds an element (and its children) from its plain dictionary form.
+    Restores the _previous links that add() would have created, so the loaded
+    card can carry on being built with up_one_level() and friends.
+    '''
+    cls = cls or _ELEMENT_CLASSES.get(data.get('type'))
+    assert cls, f"Unknown Adaptive Card element type: {data.get('type')}"
+    element = cls.__new__(cls)
+    if cls is AdaptiveCard:
+        element._pointer = element
+    elif previous is not None:
+        element._previous = previous
+    # Children of a ShowCard's inner card point back to the ShowCard itself, as with add()
+    parent = previous if cls is AdaptiveCard and previous is not None else element
+    for key, value in data.items():
+        if key == 'card' and cls is ActionShowCard and isinstance(value, dict):
+            value = _load_element(value, AdaptiveCard, element)
+        elif key in _CONTAINER_ATTRIBUTES and isinstance(value, list):
+            child_cls = _CONTAINED_CLASSES.get(key)
+            # Containers may also hold plain values, e.g. string inlines or targetElements ids
+            value = [_load_element(child, child_cls, parent) if isinstance(child, dict) else child
+                     for child in value]
+        setattr(element, key, value)
+    # Optional containers missing from the payload start out empty, as they would in __init__
+    for attribute in _DEFAULT_CONTAINERS.get(cls, ()):
+        if attribute not in element.__dict__:
+            setattr(element, attribute, [])
+    if cls is ActionShowCard and not isinstance(element.__dict__.get('card'), AdaptiveCard):
+        element.card = AdaptiveCard()
+    return element
+
+
+def card_from_dict(data: dict) -> AdaptiveCard:
+    '''
+    Rebuilds an AdaptiveCard object from its plain python dictionary representation,
+    i.e. the inverse of AdaptiveCard.to_dict().
+    '''
+    assert data.get('type') == "AdaptiveCard", "Expected a dictionary representing an AdaptiveCard"
+    return _load_element(data, AdaptiveCard)
+
+
+def card_from_bytes(payload: Union[str, bytes], format='json') -> AdaptiveCard:
+    '''
+    Rebuilds an AdaptiveCard object from the output of to_bytes() (or to_json()),
+    given the format it was serialized with: 'json', 'msgpack' or 'cbor'.
+    '''
+    assert format in _BYTES_FORMATS, f"Unsupported input format: {format}. Use one of {list(_BYTES_FORMATS)}"
+    if format == 'json':
+        data = json.loads(payload)
+    elif format == 'msgpack':
+        assert msgpack, "MessagePack input requires the msgpack package: pip install adaptivecardbuilder[msgpack]"
+        data = msgpack.unpackb(payload, raw=False)
+    else:
+        assert cbor2, "CBOR input requires the cbor2 package: pip install adaptivecardbuilder[cbor]"
+        data = cbor2.loads(payload)
+    return card_from_dict(data)
+
+
+def _to_document(card: AdaptiveCard) -> dict:
+    '''Returns the plain (JSON-compatible) form of a card, exactly as to_json() would serialize it'''
+    return json.loads(json.dumps(card, default=_serializable_fields))
+
+
+def diff_adaptive_cards(old_card: AdaptiveCard, new_card: AdaptiveCard) -> List[dict]:
+    '''
+    Compares two cards and returns a JSON Patch (RFC 6902) which, applied to the
+    serialized form of old_card, produces the serialized form of new_card.
+
+    Elements within a list are matched by their "id" where they have one, and by
+    position otherwise, so a changed TextBlock or an extra Fact yields a single
+    small operation rather than a rewrite of the whole list. Reordered elements
+    get the fewest move operations possible. Runs in O(n log n) for trees of n
+    elements, so it stays cheap enough to run on every refresh.
+    '''
+    patch: List[dict] = []
+    _diff_values(_to_document(old_card), _to_document(new_card), '', patch)
+    return patch
+
+
+def patch_adaptive_card(card: AdaptiveCard, patch: List[dict]) -> AdaptiveCard:
+    '''
+    Applies a JSON Patch (RFC 6902), such as one made by diff_adaptive_cards(),
+    to the serialized form of a card and returns the result as a new card.
+    The given card is left unchanged.
+    '''
+    document = _to_document(card)
+    for operation in patch:
+        document = _apply_operation(document, operation)
+    return card_from_dict(document)
+
+
+def _escape_token(key: Union[str, int]) -> str:
+    '''Escapes a key for use as a JSON Pointer reference token'''
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _element_id(value: object) -> Union[None, str]:
+    '''Returns the id of a serialized element, or None if it has none'''
+    if isinstance(value, dict):
+        element_id = value.get('id')
+        if isinstance(element_id, str):
+            return element_id
+    return None
+
+
+def _diff_values(old: object, new: object, path: str, patch: List[dict]) -> None:
+    '''Appends the operations turning old into new (both at the given path) onto patch'''
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dicts(old, new, path, patch)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_lists(old, new, path, patch)
+    elif type(old) != type(new) or old != new:
+        patch.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def _diff_dicts(old: dict, new: dict, path: str, patch: List[dict]) -> None:
+    '''Diffs two objects key by key'''
+    for key in old:
+        if key not in new:
+            patch.append({'op': 'remove', 'path': f"{path}/{_escape_token(key)}"})
+    for key, value in new.items():
+        key_path = f"{path}/{_escape_token(key)}"
+        if key in old:
+            _diff_values(old[key], value, key_path, patch)
+        else:
+            patch.append({'op': 'add', 'path': key_path, 'value': value})
+
+
+def _diff_lists(old: list, new: list, path: str, patch: List[dict]) -> None:
+    '''
+    Diffs two lists of elements. Elements with an id are matched to the element
+    with the same id, the remaining elements are matched up in order.
+    Unmatched old elements are removed and unmatched new elements are added.
+    Matched elements that keep their relative order (a longest increasing
+    subsequence of them) stay where they are, the rest are moved into place.
+    All matched elements are then diffed recursively.
+    '''
+    # Match every new element to an old element (or None if it is new)
+    old_by_id: dict = {}
+    old_without_id = deque()
+    for index, item in enumerate(old):
+        element_id = _element_id(item)
+        if element_id is None:
+            old_without_id.append(index)
+        else:
+            old_by_id.setdefault(element_id, deque()).append(index)
+    matches: List[Union[None, int]] = []
+    for item in new:
+        element_id = _element_id(item)
+        if element_id is None:
+            matches.append(old_without_id.popleft() if old_without_id else None)
+        else:
+            # Duplicate ids (invalid, but possible) are matched up in order
+            same_id = old_by_id.get(element_id)
+            matches.append(same_id.popleft() if same_id else None)
+    # Remove unmatched old elements, back to front so indices stay valid
+    matched = set(matches)
+    for index in range(len(old) - 1, -1, -1):
+        if index not in matched:
+            patch.append({'op': 'remove', 'path': f"{path}/{index}"})
+    # Rank of each remaining old element, i.e. its index once removals are done
+    rank = {}
+    for index in range(len(old)):
+        if index in matched:
+            rank[index] = len(rank)
+    # Elements in a longest run of unchanged relative order stay put, by new position
+    matched_positions = [position for (position, match) in enumerate(matches) if match is not None]
+    run = _longest_increasing_run([rank[matches[position]] for position in matched_positions])
+    stable_positions = [matched_positions[i] for i in run]
+    stable = set(stable_positions)
+    stable_ranks = {rank[matches[position]] for position in stable_positions}
+    # Lay every element out in slots, ordered so that occupied slots always read in list order:
+    # the gap before each stable element holds the slots elements arrive into (by new position),
+    # then the slots moved elements leave from (by old rank), then the stable element itself
+    arriving: List[List[int]] = [[] for _ in range(len(stable) + 1)]
+    leaving: List[List[int]] = [[] for _ in range(len(stable) + 1)]
+    gap = 0
+    for (position, match) in enumerate(matches):
+        if position in stable:
+            gap += 1
+        else:
+            arriving[gap].append(position)
+    gap = 0
+    for old_rank in range(len(rank)):
+        if old_rank in stable_ranks:
+            gap += 1
+        else:
+            leaving[gap].append(old_rank)
+    arrival_slot, departure_slot, stable_slot = {}, {}, {}
+    slot = 0
+    for gap in range(len(stable) + 1):
+        for position in arriving[gap]:
+            arrival_slot[position] = slot
+            slot += 1
+        for old_rank in leaving[gap]:
+            departure_slot[old_rank] = slot
+            slot += 1
+        if gap < len(stable):
+            stable_slot[stable_positions[gap]] = slot
+            slot += 1
+    occupied = _PositionIndex(slot)
+    for occupied_slot in list(departure_slot.values()) + list(stable_slot.values()):
+        occupied.set(occupied_slot, 1)
+    # Walk the new list, finding each element's current index from the occupied slots before it
+    for (position, (match, item)) in enumerate(zip(matches, new)):
+        if match is None:
+            index = occupied.before(arrival_slot[position])
+            patch.append({'op': 'add', 'path': f"{path}/{index}", 'value': item})
+            occupied.set(arrival_slot[position], 1)
+            continue
+        if position in stable:
+            index = occupied.before(stable_slot[position])
+        else:
+            source_slot = departure_slot[rank[match]]
+            source = occupied.before(source_slot)
+            occupied.set(source_slot, -1)
+            index = occupied.before(arrival_slot[position])
+            occupied.set(arrival_slot[position], 1)
+            if source != index:
+                patch.append({'op': 'move', 'from': f"{path}/{source}", 'path': f"{path}/{index}"})
+        _diff_values(old[match], item, f"{path}/{index}", patch)
+
+
+def _longest_increasing_run(values: List[int]) -> List[int]:
+    '''Returns the indices of a longest strictly increasing subsequence of values, in O(n log n)'''
+    tail_indices: List[int] = []  # index of the smallest tail of an increasing run of each length
+    tail_values: List[int] = []
+    previous = [-1] * len(values)
+    for (i, value) in enumerate(values):
+        length = bisect.bisect_left(tail_values, value)
+        if length:
+            previous[i] = tail_indices[length - 1]
+        if length == len(tail_indices):
+            tail_indices.append(i)
+            tail_values.append(value)
+        else:
+            tail_indices[length] = i
+            tail_values[length] = value
+    run = []
+    i = tail_indices[-1] if tail_indices else -1
+    while i != -1:
+        run.append(i)
+        i = previous[i]
+    return run[::-1]
+
+
+class _PositionIndex:
+    '''
+    Fenwick tree over a fixed number of slots, each occupied or not, which counts the
+    occupied slots before any given slot in O(log n). Lets _diff_lists track the current
+    index of elements as they are moved around, without shifting a list.
+    '''
+    def __init__(self, size: int):
+        self._tree = [0] * (size + 1)
+
+    def set(self, slot: int, change: int) -> None:
+        '''Marks a slot as occupied (change=1) or vacated (change=-1)'''
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] += change
+            i += i & -i
+
+    def before(self, slot: int) -> int:
+        '''Returns the number of occupied slots before the given slot'''
+        count = 0
+        i = slot
+        while i > 0:
+            count += self._tree[i]
+            i -= i & -i
+        return count
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    '''Splits a JSON Pointer into its unescaped reference tokens'''
+    if pointer == '':
+        return []
+    assert pointer.startswith('/'), f"Invalid JSON Pointer: {pointer}"
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _list_index(container: list, token: str, allow_end=False) -> int:
+    '''Converts a reference token into a valid index of the given list'''
+    if allow_end and token == '-':
+        return len(container)
+    assert token.isdigit(), f"Invalid list index in JSON Pointer: {token}"
+    index = int(token)
+    upper_bound = len(container) if allow_end else len(container) - 1
+    assert index <= upper_bound, f"List index out of range in JSON Pointer: {token}"
+    return index
+
+
+def _resolve_parent(document: object, pointer: str) -> Tuple[object, str]:
+    '''Returns the container targeted by all but the last token of a pointer, plus that last token'''
+    tokens = _parse_pointer(pointer)
+    assert tokens, "JSON Patch operation cannot target the whole document here"
+    parent = document
+    for token in tokens[:-1]:
+        parent = parent[_list_index(parent, token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def _get_value(document: object, pointer: str) -> object:
+    '''Returns the value a pointer refers to'''
+    if pointer == '':
+        return document
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        return parent[_list_index(parent, token)]
+    assert token in parent, f"JSON Pointer refers to a missing member: {pointer}"
+    return parent[token]
+
+
+def _add_value(document: object, pointer: str, value: object) -> object:
+    '''Adds a value at a pointer, returning the (possibly replaced) document'''
+    if pointer == '':
+        return value
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        parent.insert(_list_index(parent, token, allow_end=True), value)
+    else:
+        parent[token] = value
+    return document
+
+
+def _remove_value(document: object, pointer: str) -> object:
+    '''Removes and returns the value at a pointer'''
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, token))
+    assert token in parent, f"JSON Pointer refers to a missing member: {pointer}"
+    return parent.pop(token)
+
+
+def _apply_operation(document: object, operation: dict) -> object:
+    '''Applies a single JSON Patch operation, returning the (possibly replaced) document'''
+    op = operation.get('op')
+    path = operation.get('path')
+    assert op in ('add', 'remove', 'replace', 'move', 'copy', 'test'), f"Unsupported JSON Patch operation: {op}"
+    assert isinstance(path, str), f"JSON Patch operation is missing a path: {operation}"
+    if op == 'add':
+        return _add_value(document, path, copy.deepcopy(operation['value']))
+    if op == 'remove':
+        _remove_value(document, path)
+        return document
+    if op == 'replace':
+        _get_value(document, path)  # target must exist
+        if path == '':
+            return copy.deepcopy(operation['value'])
+        parent, token = _resolve_parent(document, path)
+        parent[_list_index(parent, token) if isinstance(parent, list) else token] = copy.deepcopy(operation['value'])
+        return document
+    if op == 'move':
+        source = operation['from']
+        if source == path:
+            return document
+        assert not path.startswith(source + '/'), "JSON Patch cannot move a value into one of its own children"
+        return _add_value(document, path, _remove_value(document, source))
+    if op == 'copy':
+        return _add_value(document, path, copy.deepcopy(_get_value(document, operation['from'])))
+    # op == 'test'
+    assert _get_value(document, path) == operation['value'], f"JSON Patch test failed at {path}"
+    return document
+
+
+# Properties shared by most body elements, with the card version that introduced each
+_ELEMENT_PROPERTIES = {'type': '1.0', 'id': '1.0', 'spacing': '1.0', 'separator': '1.0', 'height': '1.1',
+                       'isVisible': '1.2', 'requires': '1.2', 'fallback': '1.2'}
+_INPUT_PROPERTIES = {**_ELEMENT_PROPERTIES, 'isRequired': '1.3', 'label': '1.3', 'errorMessage': '1.3'}
+_ACTION_PROPERTIES = {'type': '1.0', 'id': '1.0', 'title': '1.0', 'iconUrl': '1.1', 'style': '1.2',
+                      'requires': '1.2', 'fallback': '1.2'}
+
+# Schema of every element: (version introducing the element, {property: version introducing the property})
+# See https://adaptivecards.io/explorer/ for the source of these tables
+_ELEMENT_SCHEMAS = {
+    "AdaptiveCard": ('1.0', {'type': '1.0', 'version': '1.0', 'schema': '1.0', '$schema': '1.0', 'body': '1.0',
+                             'actions': '1.0', 'fallbackText': '1.0', 'backgroundImage': '1.0', 'speak': '1.0',
+                             'lang': '1.0', 'selectAction': '1.1', 'verticalContentAlignment': '1.1',
+                             'minHeight': '1.2'}),
+    "Container": ('1.0', {**_ELEMENT_PROPERTIES, 'items': '1.0', 'style': '1.0', 'selectAction': '1.1',
+                          'verticalContentAlignment': '1.1', 'bleed': '1.2', 'backgroundImage': '1.2',
+                          'minHeight': '1.2'}),
+    "ColumnSet": ('1.0', {**_ELEMENT_PROPERTIES, 'columns': '1.0', 'selectAction': '1.1', 'style': '1.2',
+                          'bleed': '1.2', 'minHeight': '1.2'}),
+    "Column": ('1.0', {**_ELEMENT_PROPERTIES, 'items': '1.0', 'style': '1.0', 'width': '1.0', 'selectAction': '1.1',
+                       'verticalContentAlignment': '1.1', 'backgroundImage': '1.2', 'bleed': '1.2',
+                       'minHeight': '1.2'}),
+    "TextBlock": ('1.0', {**_ELEMENT_PROPERTIES, 'text': '1.0', 'color': '1.0', 'horizontalAlignment': '1.0',
+                          'isSubtle': '1.0', 'maxLines': '1.0', 'size': '1.0', 'weight': '1.0', 'wrap': '1.0',
+                          'fontType': '1.2'}),
+    "Image": ('1.0', {**_ELEMENT_PROPERTIES, 'url': '1.0', 'altText': '1.0', 'horizontalAlignment': '1.0',
+                      'size': '1.0', 'style': '1.0', 'backgroundColor': '1.1', 'selectAction': '1.1',
+                      'width': '1.1'}),
+    "ImageSet": ('1.0', {**_ELEMENT_PROPERTIES, 'images': '1.0', 'imageSize': '1.0'}),
+    "FactSet": ('1.0', {**_ELEMENT_PROPERTIES, 'facts': '1.0'}),
+    "Fact": ('1.0', {'title': '1.0', 'value': '1.0'}),
+    "Media": ('1.1', {**_ELEMENT_PROPERTIES, 'sources': '1.1', 'poster': '1.1', 'altText': '1.1'}),
+    "MediaSource": ('1.1', {'mimeType': '1.1', 'url': '1.1'}),
+    "RichTextBlock": ('1.2', {**_ELEMENT_PROPERTIES, 'inlines': '1.2', 'horizontalAlignment': '1.2'}),
+    "TextRun": ('1.2', {'type': '1.2', 'text': '1.2', 'color': '1.2', 'fontType': '1.2', 'highlight': '1.2',
+                        'isSubtle': '1.2', 'italic': '1.2', 'selectAction': '1.2', 'size': '1.2',
+                        'strikethrough': '1.2', 'weight': '1.2', 'underline': '1.3'}),
+    "ActionSet": ('1.2', {**_ELEMENT_PROPERTIES, 'actions': '1.2'}),
+    "Input.Text": ('1.0', {**_INPUT_PROPERTIES, 'isMultiline': '1.0', 'maxLength': '1.0', 'placeholder': '1.0',
+                           'style': '1.0', 'value': '1.0', 'inlineAction': '1.2', 'regex': '1.3'}),
+    "Input.Number": ('1.0', {**_INPUT_PROPERTIES, 'max': '1.0', 'min': '1.0', 'placeholder': '1.0', 'value': '1.0'}),
+    "Input.Date": ('1.0', {**_INPUT_PROPERTIES, 'max': '1.0', 'min': '1.0', 'placeholder': '1.0', 'value': '1.0'}),
+    "Input.Time": ('1.0', {**_INPUT_PROPERTIES, 'max': '1.0', 'min': '1.0', 'placeholder': '1.0', 'value': '1.0'}),
+    "Input.Toggle": ('1.0', {**_INPUT_PROPERTIES, 'title': '1.0', 'value': '1.0', 'valueOff': '1.0',
+                             'valueOn': '1.0', 'wrap': '1.2'}),
+    "Input.ChoiceSet": ('1.0', {**_INPUT_PROPERTIES, 'choices': '1.0', 'isMultiSelect': '1.0', 'style': '1.0',
+                                'value': '1.0', 'placeholder': '1.0', 'wrap': '1.2'}),
+    "Input.Choice": ('1.0', {'title': '1.0', 'value': '1.0'}),
+    "Action.OpenUrl": ('1.0', {**_ACTION_PROPERTIES, 'url': '1.0'}),
+    "Action.Submit": ('1.0', {**_ACTION_PROPERTIES, 'data': '1.0', 'associatedInputs': '1.3'}),
+    "Action.ShowCard": ('1.0', {**_ACTION_PROPERTIES, 'card': '1.0'}),
+    "Action.ToggleVisibility": ('1.2', {**_ACTION_PROPERTIES, 'targetElements': '1.2'}),
+    "TargetElement": ('1.2', {'elementId': '1.2', 'isVisible': '1.2'}),
+}
+
+# Card versions covered by the schema tables above
+SCHEMA_VERSIONS = ('1.0', '1.1', '1.2', '1.3')
+
+# Schema name of each element class (the serialized "type", where it has one)
+_SCHEMA_NAMES = {cls: name for (name, cls) in _ELEMENT_CLASSES.items()}
+_SCHEMA_NAMES.update({Fact: "Fact", MediaSource: "MediaSource", TargetElement: "TargetElement",
+                      InputChoice: "Input.Choice"})
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    '''Turns a version string such as "1.2" into a comparable tuple'''
+    return tuple(int(part) for part in version.split('.'))
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_schema(version: str) -> dict:
+    '''
+    Compiles the schema tables down to {element name: frozenset of allowed properties}
+    for a single card version. Elements not yet available in that version are left out.
+    Compiled once per version, then cached.
+    '''
+    assert version in SCHEMA_VERSIONS, f"No schema available for version {version}. Use one of {SCHEMA_VERSIONS}"
+    target = _version_key(version)
+    compiled = {}
+    for (name, (introduced, properties)) in _ELEMENT_SCHEMAS.items():
+        if _version_key(introduced) <= target:
+            compiled[name] = frozenset(prop for (prop, since) in properties.items() if _version_key(since) <= target)
+    return compiled
+
+
+class CardValidationError(ValueError):
+    '''Raised when a card does not conform to the schema of the version it is serialized as'''
+    def __init__(self, errors: List[str]):
+        super().__init__("Card failed schema validation:\n" + "\n".join(errors))
+        self.errors = errors
+
+
+class CardValidator:
+    '''
+    Checks each element of a card against the (compiled) schema of a card version.
+    Its fields() method stands in for the serializer's attribute hook, so elements are
+    validated during the same tree walk that serializes them.
+    In 'strict' mode the first problem raises a CardValidationError straight away,
+    in 'collect' mode all problems are gathered and raised by raise_errors().
+    '''
+    def __init__(self, card: AdaptiveCard, version: str, mode='strict'):
+        assert mode in ('strict', 'collect'), f"Unsupported validation mode: {mode}. Use 'strict' or 'collect'"
+        self.card = card
+        self.version = version
+        self.mode = mode
+        self.errors: List[str] = []
+        self._schema = _compile_schema(version)
+
+    def fields(self, item: object) -> dict:
+        '''Returns the attributes of an element to serialize, after validating them'''
+        fields = _serializable_fields(item)
+        name = _SCHEMA_NAMES.get(type(item))
+        if name is None:
+            # Subclasses of the built-in elements are checked as their parent
+            name = next((_SCHEMA_NAMES[cls] for cls in type(item).__mro__ if cls in _SCHEMA_NAMES), None)
+            if name is None:
+                return fields
+        allowed = self._schema.get(name)
+        if allowed is None:
+            self._report(item, f"{name} requires card version {_ELEMENT_SCHEMAS[name][0]} or later")
+            return fields
+        for prop in fields:
+            if prop not in allowed:
+                since = _ELEMENT_SCHEMAS[name][1].get(prop)
+                if since:
+                    self._report(item, f"{name} property '{prop}' requires card version {since} or later")
+                else:
+                    self._report(item, f"{name} has no property '{prop}'")
+        if 'type' in allowed and fields.get('type') != name:
+            self._report(item, f"{name} has type '{fields.get('type')}', expected '{name}'")
+        return fields
+
+    def raise_errors(self) -> None:
+        '''Raises a CardValidationError listing every problem found, if any'''
+        if self.errors:
+            raise CardValidationError(self.errors)
+
+    def _report(self, item: object, message: str) -> None:
+        error = f"{_element_path(self.card, item)}: {message} (version {self.version})"
+        if self.mode == 'strict':
+            raise CardValidationError([error])
+        self.errors.append(error)
+
+
+def _element_path(root: object, target: object, path='') -> Union[None, str]:
+    '''
+    Returns the JSON Pointer of an element within a card, found by walking the tree.
+    Only used to describe validation errors, so it does not need to be fast.
+    '''
+    if root is target:
+        return path or '/'
+    for (key, value) in _serializable_fields(root).items():
+        children = value if isinstance(value, list) else [value]
+        for (index, child) in enumerate(children):
+            if isinstance(child, (AdaptiveObject, AdaptiveCard)):
+                child_path = f"{path}/{_escape_token(key)}" + (f"/{index}" if isinstance(value, list) else '')
+                found = _element_path(child, target, child_path)
+                if found:
+                    return found
+    return None
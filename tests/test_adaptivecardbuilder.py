@@ -0,0 +1,534 @@
+'''
+Tests for caching, diffing, patching, loading, bytes output, stream rendering, validation and translation of cards.
+
+Usage (from the repository root):
+    python -m pytest -q
+'''
+import asyncio
+import copy
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+import aiohttp
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import adaptivecardbuilder
+from adaptivecardbuilder import *
+
+
+def build_card(rows=3) -> AdaptiveCard:
+    '''Builds a card with nested containers, facts, inputs and actions'''
+    card = AdaptiveCard()
+    for i in range(rows):
+        card.add([
+            TextBlock(f"Row {i}", weight="Bolder", id=f"row_{i}"),
+            ColumnSet(),
+                Column(width=1),
+                    TextBlock(f"Left {i}", isSubtle=True),
+                    "<",
+                Column(width=2),
+                    Image(url=f"https://example.com/{i}.png", altText="thumbnail"),
+                    "<",
+                "<",
+            FactSet(),
+                Fact("Status", "Open"),
+                "<",
+        ])
+    card.add("action")
+    card.add(ActionSubmit(title="Submit", data={"ok": True}))
+    return card
+
+
+@pytest.fixture(autouse=True)
+def empty_render_cache():
+    adaptivecardbuilder.render_cache.clear()
+    yield
+    adaptivecardbuilder.render_cache.clear()
+
+
+# Content hashing and caching
+
+def fresh_hash(card: AdaptiveCard) -> str:
+    '''Hash of the card computed from scratch, as copies start out without memoized digests'''
+    return copy.deepcopy(card).content_hash()
+
+
+def test_content_hash_ignores_how_card_was_built():
+    card = build_card()
+    assert card.content_hash() == build_card().content_hash()
+    card.back_to_top()
+    assert card.content_hash() == build_card().content_hash()
+
+
+def test_content_hash_follows_changes():
+    card = build_card()
+    hashes = {card.content_hash()}
+    edits = [
+        lambda: setattr(card.body[0], 'text', "Changed"),
+        lambda: card.body[1].columns[0].items.append(TextBlock("Nested")),
+        lambda: card.body[1].columns[1].items[0].__setattr__('url', "https://example.com/other.png"),
+        lambda: card.body[2].facts.pop(),
+        lambda: card.actions[0].data.update(ok=False),
+        lambda: card.actions[0].data.setdefault('rows', []).append(1),
+        lambda: card.body[4].columns.__setitem__(slice(0, 1), [Column(items=[TextBlock("Replaced")])]),
+        lambda: card.body[4].columns[0].items[0].__setattr__('text', "Replaced again"),
+        lambda: card.body.reverse(),
+    ]
+    for edit in edits:
+        edit()
+        digest = card.content_hash()
+        assert digest not in hashes
+        assert digest == fresh_hash(card)
+        hashes.add(digest)
+
+
+def test_content_hash_of_shared_element():
+    shared = TextBlock("Shared")
+    first = AdaptiveCard()
+    first.add(shared)
+    second = AdaptiveCard()
+    second.add(shared)
+    (first_hash, second_hash) = (first.content_hash(), second.content_hash())
+    shared.text = "Changed"
+    assert first.content_hash() != first_hash
+    assert second.content_hash() != second_hash
+    assert first.content_hash() == second.content_hash() == fresh_hash(first)
+
+
+def test_content_hash_random_edits():
+    rng = random.Random(26)
+    card = build_card(rows=5)
+    for _ in range(300):
+        elements = [card]
+        for element in elements:
+            for container in ('body', 'actions', 'items', 'columns', 'facts'):
+                elements.extend(getattr(element, container, []))
+        element = rng.choice(elements)
+        container = next((getattr(element, name) for name in ('body', 'items', 'columns')
+                          if hasattr(element, name)), None)
+        if container is not None and rng.random() < 0.5:
+            if container and rng.random() < 0.5:
+                container.pop(rng.randrange(len(container)))
+            else:
+                container.insert(rng.randrange(len(container) + 1), TextBlock(f"New {rng.random()}"))
+        else:
+            element.spacing = rng.choice(["small", "medium", "large"])
+        assert card.content_hash() == fresh_hash(card)
+
+
+def test_cache_is_used_by_default():
+    card = build_card()
+    first = asyncio.run(card.to_json())
+    assert asyncio.run(card.to_json()) is first
+    assert asyncio.run(card.to_json(use_cache=False)) is not first
+
+
+def test_cache_is_invalidated_by_changes():
+    card = build_card()
+    before = asyncio.run(card.to_json())
+    card.add(TextBlock("Late addition"))
+    after = asyncio.run(card.to_json())
+    assert before != after
+    assert "Late addition" in after
+
+
+def test_translation_leaves_card_untouched():
+    card = build_card()
+    original = asyncio.run(card.to_dict())
+    translator = FakeTranslator()
+    translated = asyncio.run(card.to_dict(translator_to_lang="fr", translator=translator))
+    assert translated["body"][0]["text"] == "[fr] Row 0"
+    assert asyncio.run(card.to_dict()) == original
+    assert card.content_hash() == fresh_hash(card)
+    # A cache hit does not call the translator again
+    asyncio.run(card.to_dict(translator_to_lang="fr", translator=translator))
+    assert translator.request_count == 1
+
+
+# Diffing and patching
+
+def random_value(rng: random.Random, depth=0) -> object:
+    kind = rng.randrange(5 if depth < 3 else 3)
+    if kind == 0:
+        return rng.randrange(5)
+    if kind == 1:
+        return rng.choice(["a", "b", "c"])
+    if kind == 2:
+        return None
+    if kind == 3:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return {rng.choice("xyz"): random_value(rng, depth + 1) for _ in range(rng.randrange(4))}
+
+
+def random_element_list(rng: random.Random) -> list:
+    ids = [f"e{i}" for i in range(rng.randrange(8))]
+    elements = [{"id": rng.choice(ids) if ids and rng.random() < 0.8 else None, "v": rng.randrange(3)}
+                for _ in range(rng.randrange(8))]
+    return [{k: v for k, v in element.items() if v is not None} for element in elements]
+
+
+def test_diff_patch_round_trip_random_documents():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        old = {"body": random_element_list(rng), "other": random_value(rng)}
+        new = {"body": random_element_list(rng), "other": random_value(rng)}
+        patch = []
+        adaptivecardbuilder._diff_values(old, new, '', patch)
+        document = copy.deepcopy(old)
+        for operation in patch:
+            document = adaptivecardbuilder._apply_operation(document, operation)
+        assert document == new, (old, new, patch)
+
+
+def test_diff_patch_round_trip_cards():
+    old = build_card()
+    new = build_card()
+    new.body[0].text = "Changed"
+    new.body.insert(0, new.body.pop())
+    del new.body[2]
+    new.add(Image(url="https://example.com/new.png"))
+    patch = diff_adaptive_cards(old, new)
+    patched = patch_adaptive_card(old, patch)
+    assert asyncio.run(patched.to_dict()) == asyncio.run(new.to_dict())
+    # The original card is left untouched
+    assert asyncio.run(old.to_dict()) == asyncio.run(build_card().to_dict())
+
+
+def test_diff_of_identical_cards_is_empty():
+    assert diff_adaptive_cards(build_card(), build_card()) == []
+
+
+def test_diff_moves_reordered_elements():
+    old = AdaptiveCard()
+    old.add([TextBlock(f"Block {i}", id=f"block_{i}") for i in range(6)])
+    new = copy.deepcopy(old)
+    new.body.append(new.body.pop(0))
+    patch = diff_adaptive_cards(old, new)
+    assert [operation['op'] for operation in patch] == ['move']
+    assert asyncio.run(patch_adaptive_card(old, patch).to_dict()) == asyncio.run(new.to_dict())
+
+
+def test_patch_test_operation_failure():
+    card = build_card()
+    with pytest.raises(AssertionError):
+        patch_adaptive_card(card, [{"op": "test", "path": "/body/0/text", "value": "Not the text"}])
+
+
+# Loading
+
+def test_loader_round_trip():
+    card = build_card()
+    card.add(ActionShowCard(title="More"))
+    card.add(TextBlock("Inside the show card"))
+    data = asyncio.run(card.to_dict())
+    loaded = card_from_dict(data)
+    assert isinstance(loaded.body[1], ColumnSet)
+    assert isinstance(loaded.body[1].columns[0].items[0], TextBlock)
+    assert isinstance(loaded.actions[-1].card, AdaptiveCard)
+    assert asyncio.run(loaded.to_dict()) == data
+
+
+def test_loaded_card_can_be_extended():
+    data = {"type": "AdaptiveCard", "version": "1.2", "body": [{"type": "Container"}]}
+    loaded = card_from_dict(data)
+    assert loaded.actions == []
+    loaded.add(ActionSubmit(title="Submit"))
+    loaded.load_level(loaded.body[0])
+    loaded.add(TextBlock("Added after loading"))
+    result = asyncio.run(loaded.to_dict())
+    assert result["body"][0]["items"][0]["text"] == "Added after loading"
+    assert result["actions"][0]["title"] == "Submit"
+
+
+def test_loader_keeps_plain_values_in_containers():
+    data = {"type": "AdaptiveCard", "version": "1.2", "body": [
+        {"type": "RichTextBlock", "inlines": ["plain", {"type": "TextRun", "text": "run"}]},
+        {"type": "ActionSet", "actions": [{"type": "Action.ToggleVisibility", "targetElements": ["row_0"]}]},
+    ]}
+    loaded = card_from_dict(data)
+    assert loaded.body[0].inlines[0] == "plain"
+    assert isinstance(loaded.body[0].inlines[1], TextRun)
+    assert asyncio.run(loaded.to_dict())["body"] == data["body"]
+    # Patches and bytes payloads holding such values load too
+    patched = patch_adaptive_card(loaded, [{"op": "add", "path": "/body/0/inlines/-", "value": "more"}])
+    assert patched.body[0].inlines[-1] == "more"
+    reloaded = card_from_bytes(asyncio.run(patched.to_bytes()))
+    assert asyncio.run(reloaded.to_dict()) == asyncio.run(patched.to_dict())
+
+
+def test_unknown_element_type_is_rejected():
+    with pytest.raises(AssertionError):
+        card_from_dict({"type": "AdaptiveCard", "body": [{"type": "Carousel"}]})
+
+
+# Bytes output
+
+def test_to_bytes_matches_to_json():
+    card = build_card()
+    as_json = asyncio.run(card.to_json())
+    assert asyncio.run(card.to_bytes()) == as_json.encode('utf-8')
+    assert json.loads(as_json) == asyncio.run(card.to_dict())
+
+
+def test_cached_bytes_are_not_reencoded():
+    card = build_card()
+    first = asyncio.run(card.to_bytes())
+    second = asyncio.run(card.to_bytes())
+    assert isinstance(first, bytes)
+    assert first is second
+    assert isinstance(asyncio.run(card.to_json()), str)
+
+
+@pytest.mark.parametrize('format', ['json', 'msgpack', 'cbor'])
+def test_bytes_round_trip(format):
+    module = {'json': 'json', 'msgpack': 'msgpack', 'cbor': 'cbor2'}[format]
+    if importlib.util.find_spec(module) is None:
+        pytest.skip(f"{module} is not installed")
+    card = build_card()
+    loaded = card_from_bytes(asyncio.run(card.to_bytes(format)), format)
+    assert asyncio.run(loaded.to_dict()) == asyncio.run(card.to_dict())
+    assert loaded.content_hash() == card.content_hash()
+
+
+def test_unsupported_bytes_format_is_rejected():
+    with pytest.raises(AssertionError):
+        asyncio.run(build_card().to_bytes('json-bytes'))
+
+
+# Rendering streams
+
+def collect(stream) -> list:
+    async def _collect():
+        return [item async for item in stream]
+    return asyncio.run(_collect())
+
+
+def numbered_cards(count: int, blocks=1) -> List[AdaptiveCard]:
+    cards = []
+    for i in range(count):
+        card = AdaptiveCard()
+        card.add([TextBlock(f"Card {i}") for _ in range(blocks)])
+        cards.append(card)
+    return cards
+
+
+class SlowFirstTranslator(FakeTranslator):
+    '''Takes longer to translate the strings of "Card 0" than those of any other card'''
+    async def translate(self, texts, to_lang):
+        await asyncio.sleep(0.2 if texts[0] == "Card 0" else 0.0)
+        return await super().translate(texts, to_lang)
+
+
+def test_render_stream_preserves_order():
+    results = collect(render_stream(numbered_cards(20), concurrency=4))
+    assert [json.loads(result)["body"][0]["text"] for result in results] == [f"Card {i}" for i in range(20)]
+
+
+def test_render_stream_preserves_order_when_translating():
+    # Cards of 100 strings fill a batch each, so every card is translated in its own request
+    results = collect(render_stream(numbered_cards(4, blocks=100), translator_to_lang="fr",
+                                    translator=SlowFirstTranslator(), concurrency=4))
+    assert [json.loads(result)["body"][0]["text"] for result in results] == [f"[fr] Card {i}" for i in range(4)]
+
+
+def test_render_stream_unordered_pairs_results_with_cards():
+    cards = numbered_cards(4, blocks=100)
+
+    async def source():
+        # Let the first card's translation request go out on its own
+        for card in cards:
+            yield card
+            await asyncio.sleep(0.01)
+
+    results = collect(render_stream(source(), translator_to_lang="fr", translator=SlowFirstTranslator(),
+                                    concurrency=4, ordered=False))
+    # The slow first card completes last, yet is still paired with its own result
+    assert [card for (card, _) in results][-1] is cards[0]
+    assert sorted(id(card) for (card, _) in results) == sorted(id(card) for card in cards)
+    for (card, result) in results:
+        text = card.body[0].text
+        assert json.loads(result)["body"][0]["text"] == f"[fr] {text}"
+
+
+def test_render_stream_coalesces_translation_requests():
+    cards = [build_card() for _ in range(10)]
+    for (i, card) in enumerate(cards):
+        card.body[0].text = f"Card {i}"
+    translator = FakeTranslator(batch_size=1000)
+    results = collect(render_stream(cards, translator_to_lang="de", translator=translator, concurrency=10,
+                                    format='json'))
+    assert all(isinstance(result, bytes) for result in results)
+    assert [json.loads(result)["body"][0]["text"] for result in results] == [f"[de] Card {i}" for i in range(10)]
+    assert translator.request_count == 1
+    assert asyncio.run(cards[0].to_dict())["body"][0]["text"] == "Card 0"
+
+
+@pytest.mark.parametrize('concurrency', [1, 4, 16])
+def test_render_stream_does_not_linger_when_no_card_can_join(concurrency):
+    # Whether at the concurrency limit or with the source run dry, batches go out without waiting out the linger
+    cards = numbered_cards(8)
+    started = time.perf_counter()
+    results = collect(render_stream(cards, translator_to_lang="fr", translator=FakeTranslator(),
+                                    concurrency=concurrency, linger=1.0))
+    assert time.perf_counter() - started < 1.0
+    assert len(results) == 8
+
+
+def test_render_stream_lingers_while_cards_can_arrive():
+    cards = numbered_cards(2)
+
+    async def source():
+        yield cards[0]
+        await asyncio.sleep(0.05)
+        yield cards[1]
+
+    translator = FakeTranslator()
+    collect(render_stream(source(), translator_to_lang="fr", translator=translator, concurrency=2, linger=0.5))
+    # The second card arrived within the first card's linger window, so joined its request
+    assert translator.request_count == 1
+
+
+# Validation
+
+def test_valid_card_passes_every_version():
+    card = AdaptiveCard()
+    card.add([TextBlock("Hello", weight="Bolder"), FactSet(), Fact("a", "b"), "<"])
+    for version in SCHEMA_VERSIONS:
+        asyncio.run(card.to_json(version=version, validation='strict'))
+
+
+def test_strict_validation_reports_unknown_property():
+    card = AdaptiveCard()
+    card.add(TextBlock("Hello", wieght="Bolder"))
+    with pytest.raises(CardValidationError) as error:
+        asyncio.run(card.to_json(validation='strict'))
+    assert error.value.errors == ["/body/0: TextBlock has no property 'wieght' (version 1.2)"]
+
+
+def test_validation_reports_element_newer_than_version():
+    card = AdaptiveCard()
+    card.add([RichTextBlock(), TextRun("Hello"), "<"])
+    asyncio.run(card.to_json(version="1.2", validation='strict'))
+    with pytest.raises(CardValidationError) as error:
+        asyncio.run(card.to_json(version="1.0", validation='strict'))
+    assert "RichTextBlock requires card version 1.2 or later" in error.value.errors[0]
+
+
+def test_collect_validation_gathers_every_problem():
+    fact = Fact("a", "b")
+    fact.type = "Fact"
+    card = AdaptiveCard()
+    card.add([
+        FactSet(),
+            fact,
+            "<",
+        InputText(ID="name", label="Name"),
+    ])
+    with pytest.raises(CardValidationError) as error:
+        asyncio.run(card.to_json(version="1.2", validation='collect'))
+    assert error.value.errors == [
+        "/body/0/facts/0: Fact has no property 'type' (version 1.2)",
+        "/body/1: Input.Text property 'label' requires card version 1.3 or later (version 1.2)",
+    ]
+
+
+def test_validation_does_not_affect_output():
+    card = build_card()
+    assert asyncio.run(card.to_json(validation='strict')) == asyncio.run(card.to_json())
+
+
+def test_validated_output_is_cached_separately():
+    card = AdaptiveCard()
+    card.add(TextBlock("Hello", wieght="Bolder"))
+    # An unvalidated render in the cache must not let an invalid card through validation
+    asyncio.run(card.to_json())
+    with pytest.raises(CardValidationError):
+        asyncio.run(card.to_json(validation='strict'))
+
+
+# Translation providers
+
+class ShoutingTranslator(TranslationProvider):
+    '''Provider without a cache token, counting its calls'''
+    def __init__(self):
+        self.calls = 0
+
+    async def translate(self, texts, to_lang):
+        self.calls += 1
+        return [text.upper() for text in texts]
+
+
+def test_fake_translator_batches_requests():
+    translator = FakeTranslator(batch_size=4)
+    card = AdaptiveCard()
+    card.add([TextBlock(f"Block {i}") for i in range(10)])
+    result = asyncio.run(card.to_dict(translator_to_lang="es", translator=translator))
+    assert [block["text"] for block in result["body"]] == [f"[es] Block {i}" for i in range(10)]
+    assert (translator.request_count, translator.string_count) == (3, 10)
+
+
+def test_dont_translate_is_respected():
+    card = AdaptiveCard()
+    card.add([TextBlock("Translated"), TextBlock("Kept", dont_translate=True)])
+    result = asyncio.run(card.to_dict(translator_to_lang="es", translator=FakeTranslator()))
+    assert [block["text"] for block in result["body"]] == ["[es] Translated", "Kept"]
+    assert "dont_translate" not in result["body"][1]
+
+
+def test_unsupported_language_is_rejected():
+    translator = FakeTranslator(supported_languages=["fr"])
+    with pytest.raises(AssertionError):
+        asyncio.run(build_card().to_json(translator_to_lang="de", translator=translator))
+
+
+def test_cache_is_keyed_by_translation_provider():
+    class LoudTranslator(FakeTranslator):
+        cache_token = ('LoudTranslator',)
+
+        async def translate(self, texts, to_lang):
+            return [text.upper() for text in texts]
+
+    card = build_card()
+    quiet = asyncio.run(card.to_json(translator_to_lang="fr", translator=FakeTranslator()))
+    loud = asyncio.run(card.to_json(translator_to_lang="fr", translator=LoudTranslator()))
+    assert quiet != loud
+    assert "ROW 0" in loud
+
+
+def test_providers_without_cache_token_are_not_cached():
+    translator = ShoutingTranslator()
+    card = build_card()
+    for _ in range(2):
+        asyncio.run(card.to_json(translator_to_lang="fr", translator=translator))
+    assert translator.calls == 2
+
+
+def test_azure_translator_against_local_server():
+    async def translate():
+        backend = FakeTranslator()
+        async with LocalTranslationServer(backend) as server:
+            async with AzureTranslator("any key", base_url=server.url, batch_size=2) as translator:
+                result = await build_card().to_dict(translator_to_lang="fr", translator=translator,
+                                                    use_cache=False)
+        return (result, backend.request_count)
+
+    (result, request_count) = asyncio.run(translate())
+    assert result["body"][0]["text"] == "[fr] Row 0"
+    assert result["actions"][0]["title"] == "[fr] Submit"
+    assert request_count > 1
+
+
+def test_local_server_rejects_unsupported_language():
+    async def translate():
+        async with LocalTranslationServer(FakeTranslator(supported_languages=["fr"])) as server:
+            async with AzureTranslator("any key", base_url=server.url) as translator:
+                await translator.translate(["Hello"], "de")
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(translate())